@@ -1,90 +1,310 @@
 import streamlit as st
 import pandas as pd
-import random
 import os
 import time
 import json
-from io import StringIO, BytesIO
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO
 from datetime import datetime
 
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
 import boto3
 import botocore
+from botocore.config import Config
 from faker import Faker
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
-fake = Faker()
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; it parses the same documents as json, faster
+    _json_loads = json.loads
+
+# Faker locale used for the text column pools
+FAKER_LOCALE = "en_US"
+# Size of the pre-sampled token pools used by the Faker-backed column types
+FAKER_POOL_SIZE = 5000
+EMAIL_DOMAINS = ["gmail.com", "yahoo.com", "hotmail.com", "outlook.com", "example.com", "example.org", "example.net"]
 
 # Feature toggle: set ENABLE_BEDROCK=true in env to enable Bedrock calls
 ENABLE_BEDROCK = os.environ.get("ENABLE_BEDROCK", "false").lower() in ("1", "true", "yes")
 # Model identifier for Bedrock (override with env var if needed)
 BEDROCK_MODEL = os.environ.get("BEDROCK_MODEL", "model-id-placeholder")
+# Upper bound on concurrent Bedrock calls and on calls per minute (AIMD backpressure below);
+# both are at least 1, since 0 would leave the limiter and thread pool unable to run anything
+BEDROCK_MAX_CONCURRENCY = max(1, int(os.environ.get("BEDROCK_MAX_CONCURRENCY", "4")))
+BEDROCK_MAX_RPM = max(1, int(os.environ.get("BEDROCK_MAX_RPM", "60")))
+# botocore's adaptive mode retries throttled calls with client-side rate limiting; the pool
+# is sized so concurrent Text (AI) calls do not queue for an HTTP connection
+BEDROCK_CLIENT_CONFIG = Config(retries={"mode": "adaptive", "max_attempts": 5}, max_pool_connections=50)
+# Generating a whole column in one call can take well over a minute, so reads get far more
+# room than connects; a read timeout that is too short makes botocore
+# resend the full (token-billed) request on every retry
+BEDROCK_READ_TIMEOUT = int(os.environ.get("BEDROCK_READ_TIMEOUT", "120"))
+THROTTLE_ERROR_CODES = ("ThrottlingException", "TooManyRequestsException")
+RATE_LIMIT_REMAINING_HEADERS = ("x-ratelimit-remaining-requests", "anthropic-ratelimit-requests-remaining")
+# Outermost JSON array / object in a model response that wraps it in prose (greedy, so first "[" to last "]")
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
 
 # ---- Helpers ----
 NUMERIC_TYPES = ["Integer", "Float"]
 TEXT_TYPES = ["Name", "Email", "Address", "Text (AI)", "Company"]
 DATE_TYPES = ["Date"]
 ALL_TYPES = NUMERIC_TYPES + TEXT_TYPES + DATE_TYPES
+# Types generated for all matching columns at once by build_dataset
+BATCH_TYPES = NUMERIC_TYPES + DATE_TYPES
+# Arrow type of each generated column; every other type is a string column
+ARROW_TYPES = {"Integer": pa.int32(), "Float": pa.float32(), "Date": pa.date32()}
+
+TEXT_AI_PROMPT = "Short realistic text example (e.g., product description, review, or support message)."
+# Offline stand-ins for Text (AI) when Bedrock is disabled or fails
+FALLBACK_TEXTS = np.array(
+    [
+        "Sample product description",
+        "Example support ticket",
+        "Short customer review",
+        "User feedback text",
+    ],
+    dtype=object,
+)
+
+def _email_token(value):
+    return "".join(ch for ch in value.lower() if ch.isalnum())
+
+
+@st.cache_resource(max_entries=16)
+def _get_faker(locale=FAKER_LOCALE):
+    """One Faker instance per locale, shared across reruns and sessions."""
+    return Faker(locale)
+
+
+@st.cache_resource
+def _faker_pools(locale=FAKER_LOCALE, pool_size=FAKER_POOL_SIZE):
+    """Sample Faker once into NumPy object arrays so columns can be assembled by indexing."""
+    faker = _get_faker(locale)
+    # fixed seed so a dataset seed reproduces the same rows across server restarts
+    faker.seed_instance(0)
+
+    def sample(provider):
+        # provider is a pre-bound method, so the loop skips the per-call attribute lookup
+        return np.array([provider() for _ in range(pool_size)], dtype=object)
+
+    pools = {
+        "first": sample(faker.first_name),
+        "last": sample(faker.last_name),
+        "street": sample(faker.street_address),
+        "city": sample(faker.city),
+        "state": sample(faker.state_abbr),
+        "postcode": sample(faker.postcode),
+        "company": sample(faker.company),
+        "domain": np.array(EMAIL_DOMAINS, dtype=object),
+    }
+    pools["first_email"] = np.array([_email_token(v) for v in pools["first"]], dtype=object)
+    pools["last_email"] = np.array([_email_token(v) for v in pools["last"]], dtype=object)
+    return pools
+
+
+def _pick(pool, n_rows, rng):
+    return pool[rng.integers(0, len(pool), size=n_rows)]
 
-def generate_column(col_type, n_rows):
+
+def _generate_batch(col_type, n_rows, n_cols, rng):
+    """Generate n_cols columns of a vectorizable type in one NumPy call; returns an (n_cols, n_rows) array."""
     if col_type == "Integer":
-        return np.random.randint(0, 1000, size=n_rows).tolist()
+        return rng.integers(0, 1000, size=(n_cols, n_rows), dtype=np.int32)
     if col_type == "Float":
-        return np.round(np.random.uniform(0, 1000, size=n_rows), 2).tolist()
+        # drawn directly as float32 (no float64 buffer) and rounded in place; values are the
+        # nearest float32 to the 2-decimal number, which is exact enough for synthetic data
+        values = rng.random(size=(n_cols, n_rows), dtype=np.float32)
+        values *= 1000
+        return np.round(values, 2, out=values)
+    if col_type == "Date":
+        # random day-precision dates in the last 2 years, kept as datetime64[D] (no Python date objects)
+        start = np.datetime64("today", "D") - np.timedelta64(365 * 2, "D")
+        rand_days = rng.integers(0, 365 * 2 + 1, size=(n_cols, n_rows)).astype("timedelta64[D]")
+        return start + rand_days
+    raise ValueError(f"Column type {col_type!r} cannot be batch-generated")
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _generate_local_column(col_type, n_rows, seed):
+    """Generate a column without Bedrock; deterministic, so (type, n_rows, seed) keys the cache."""
+    # PCG64-backed generator; faster than the legacy np.random (MT19937) singleton
+    rng = np.random.default_rng(seed)
+    if col_type in BATCH_TYPES:
+        return _generate_batch(col_type, n_rows, 1, rng)[0]
     if col_type == "Name":
-        return [fake.name() for _ in range(n_rows)]
+        pools = _faker_pools()
+        return _pick(pools["first"], n_rows, rng) + " " + _pick(pools["last"], n_rows, rng)
     if col_type == "Email":
-        return [fake.email() for _ in range(n_rows)]
+        pools = _faker_pools()
+        return (
+            _pick(pools["first_email"], n_rows, rng) + "." + _pick(pools["last_email"], n_rows, rng)
+            + "@" + _pick(pools["domain"], n_rows, rng)
+        )
     if col_type == "Address":
-        return [fake.address().replace("\n", ", ") for _ in range(n_rows)]
+        pools = _faker_pools()
+        return (
+            _pick(pools["street"], n_rows, rng) + ", " + _pick(pools["city"], n_rows, rng)
+            + ", " + _pick(pools["state"], n_rows, rng) + " " + _pick(pools["postcode"], n_rows, rng)
+        )
     if col_type == "Company":
-        return [fake.company() for _ in range(n_rows)]
-    if col_type == "Date":
-        # generate random dates in last 2 years using pandas/numpy
-        start = pd.Timestamp.today() - pd.Timedelta(days=365 * 2)
-        end = pd.Timestamp.today()
-        rand_days = np.random.randint(0, (end - start).days + 1, size=n_rows)
-        return (start + pd.to_timedelta(rand_days, unit="D")).date.tolist()
+        return _pick(_faker_pools()["company"], n_rows, rng)
     if col_type == "Text (AI)":
-        prompt_template = "Short realistic text example (e.g., product description, review, or support message)."
-        # If enabled, try calling Bedrock once for a batch; otherwise fallback to Faker
-        if ENABLE_BEDROCK:
-            texts = call_bedrock_batch(n_rows, prompt_template)
-            if texts is not None and len(texts) == n_rows:
-                return texts
-            # fallback to faker if bedrock fails
-        prompts = [
-            "Sample product description",
-            "Example support ticket",
-            "Short customer review",
-            "User feedback text",
-        ]
-        return [random.choice(prompts) + f" #{i}" for i in range(n_rows)]
+        # offline stand-in; Bedrock text goes through generate_bedrock_column instead
+        suffixes = np.arange(n_rows).astype(str).astype(object)
+        return _pick(FALLBACK_TEXTS, n_rows, rng) + " #" + suffixes
     return [None] * n_rows
 
 
-def call_bedrock_batch(n_rows, prompt_template, timeout=10):
-    """Attempt to call Bedrock to generate a JSON array of strings. Returns list or None on failure."""
+@st.cache_data(max_entries=16, show_spinner=False)
+def generate_bedrock_column(n_rows, seed):
+    """Text (AI) values for one column from Bedrock; seed only keys the cache.
+
+    Raises ValueError when Bedrock gives no usable answer, so failures are never cached.
+    """
+    texts = call_bedrock_batch(n_rows, TEXT_AI_PROMPT)
+    # non-string items (numbers, objects, null) would otherwise end up as Python reprs in a string column
+    if texts is None or len(texts) != n_rows or not all(isinstance(t, str) for t in texts):
+        raise ValueError("Bedrock returned no usable column")
+    return texts
+
+
+def generate_column(col_type, n_rows, seed):
+    """Generate one column; seed is anything np.random.default_rng accepts.
+
+    Only successful Bedrock answers are cached for Text (AI); the offline fallback runs outside
+    that cache, so a transient Bedrock failure is retried on the next Generate.
+    """
+    if col_type == "Text (AI)" and ENABLE_BEDROCK:
+        try:
+            return generate_bedrock_column(n_rows, seed)
+        except ValueError:
+            pass
+    return _generate_local_column(col_type, n_rows, seed)
+
+
+class AIMDLimiter:
+    """Additive-increase/multiplicative-decrease cap on in-flight calls, plus a sliding one-minute request window.
+
+    The limit grows by alpha after each call that gets a response and is multiplied by beta after
+    a throttle signal. Latency is not a signal: a whole-column generation is slow even when the
+    service is healthy, so slow-but-successful calls count as successes.
+    """
+
+    def __init__(self, max_concurrency, rpm, alpha=0.5, beta=0.5):
+        self.max_concurrency = max_concurrency
+        self.rpm = rpm
+        self.alpha = alpha
+        self.beta = beta
+        self.limit = 1.0
+        self._in_flight = 0
+        self._sent = deque()
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                while self._sent and now - self._sent[0] >= 60:
+                    self._sent.popleft()
+                window_full = len(self._sent) >= self.rpm
+                if not window_full and self._in_flight < int(self.limit):
+                    break
+                # wait for a release, or for the oldest request to leave the window
+                self._cond.wait(timeout=60 - (now - self._sent[0]) if window_full else None)
+            self._in_flight += 1
+            self._sent.append(now)
+
+    def release(self, responded=False, throttled=False):
+        """responded is False when the call failed for a reason unrelated to load; the limit is then left alone."""
+        with self._cond:
+            self._in_flight -= 1
+            if throttled:
+                self.limit = max(1.0, self.limit * self.beta)
+            elif responded:
+                self.limit = min(float(self.max_concurrency), self.limit + self.alpha)
+            self._cond.notify_all()
+
+
+@st.cache_resource
+def _bedrock_limiter():
+    """One limiter per server process, so concurrent sessions share the Bedrock quota."""
+    return AIMDLimiter(BEDROCK_MAX_CONCURRENCY, BEDROCK_MAX_RPM)
+
+
+def _rate_limit_exhausted(resp):
+    headers = resp.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+    return any(headers.get(h) == "0" for h in RATE_LIMIT_REMAINING_HEADERS)
+
+
+@st.cache_resource
+def _bedrock_client(timeout=10):
+    """One boto3 client per process and connect timeout; building a client loads service JSON and the credential chain."""
+    config = BEDROCK_CLIENT_CONFIG.merge(Config(connect_timeout=timeout, read_timeout=BEDROCK_READ_TIMEOUT))
     try:
-        client = boto3.client("bedrock-runtime")
+        return boto3.client("bedrock-runtime", config=config)
     except Exception:
-        try:
-            client = boto3.client("bedrock")
-        except Exception:
-            return None
+        return boto3.client("bedrock", config=config)
+
+
+def _invoke_bedrock(system_prompt, timeout=10):
+    """Send one prompt to Bedrock under the AIMD limiter. Returns the response body text or None on failure."""
+    try:
+        client = _bedrock_client(timeout)
+    except Exception:
+        return None
 
-    system_prompt = (
-        f"Generate {n_rows} short texts for this task: {prompt_template}. "
-        "Return only a JSON array of strings (no extra commentary)."
-    )
     payload = {"input": system_prompt}
+    limiter = _bedrock_limiter()
+    limiter.acquire()
+    responded = False
+    throttled = False
     try:
         # Attempt generic invoke; exact API may vary depending on SDK/version.
         resp = client.invoke_model(modelId=BEDROCK_MODEL, contentType="application/json", body=json.dumps(payload))
+        responded = True
+        # back off pre-emptively when the provider reports the request budget is used up
+        throttled = _rate_limit_exhausted(resp)
         body = resp.get("body")
         if hasattr(body, "read"):
             body = body.read().decode("utf-8")
+        return body
+    except botocore.exceptions.NoCredentialsError:
+        return None
+    except botocore.exceptions.ClientError as e:
+        throttled = e.response.get("Error", {}).get("Code") in THROTTLE_ERROR_CODES
+        return None
+    except Exception:
+        return None
+    finally:
+        limiter.release(responded, throttled)
+
+
+def call_bedrock_batch(n_rows, prompt_template, timeout=10):
+    """Attempt to call Bedrock to generate a JSON array of strings. Returns list or None on failure."""
+    system_prompt = (
+        f"Generate {n_rows} short texts for this task: {prompt_template}. "
+        "Return only a JSON array of strings (no extra commentary)."
+    )
+    body = _invoke_bedrock(system_prompt, timeout)
+    if body is None:
+        return None
+    try:
         # Try to extract JSON array
-        parsed = json.loads(body)
+        try:
+            parsed = _json_loads(body)
+        except ValueError:
+            parsed = None
         if isinstance(parsed, list):
             return parsed[:n_rows]
         # Sometimes model returns a dict with 'output'
@@ -93,23 +313,153 @@ def call_bedrock_batch(n_rows, prompt_template, timeout=10):
                 if isinstance(v, list):
                     return v[:n_rows]
         # Last resort: try to find a JSON array substring
-        start = body.find("[")
-        end = body.rfind("]")
-        if start != -1 and end != -1 and end > start:
-            return json.loads(body[start : end + 1])[:n_rows]
-    except botocore.exceptions.NoCredentialsError:
-        return None
+        match = _JSON_ARRAY_RE.search(body)
+        if match is not None:
+            return _json_loads(match.group())[:n_rows]
     except Exception:
         return None
     return None
 
-def build_dataset(schema, n_rows):
+
+def call_bedrock_columns(n_rows, n_cols, prompt_template, timeout=10):
+    """Generate n_cols Text (AI) columns with a single Bedrock call.
+
+    Returns a list of n_cols lists of n_rows strings, or None if the call fails or any column
+    is missing or short in the response.
+    """
+    keys = [f"col{k + 1}" for k in range(n_cols)]
+    system_prompt = (
+        f"Generate {n_cols} independent sets of {n_rows} short texts for this task: {prompt_template}. "
+        f"Return only a JSON object with keys {', '.join(keys)}, "
+        f"each a JSON array of {n_rows} strings (no extra commentary)."
+    )
+    body = _invoke_bedrock(system_prompt, timeout)
+    if body is None:
+        return None
+    try:
+        try:
+            parsed = _json_loads(body)
+        except ValueError:
+            # the model may wrap the object in prose; parse the outermost {...}
+            match = _JSON_OBJECT_RE.search(body)
+            if match is None:
+                return None
+            parsed = _json_loads(match.group())
+        if not isinstance(parsed, dict):
+            return None
+        columns = [parsed.get(key) for key in keys]
+        if not all(isinstance(col, list) and len(col) >= n_rows for col in columns):
+            return None
+        return [col[:n_rows] for col in columns]
+    except Exception:
+        return None
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def generate_text_ai_columns(n_rows, seeds):
+    """Text (AI) values for len(seeds) columns from one Bedrock request; seeds only key the cache.
+
+    Raises ValueError when Bedrock gives no usable answer, so failures are never cached.
+    """
+    texts = call_bedrock_columns(n_rows, len(seeds), TEXT_AI_PROMPT)
+    if texts is None or not all(isinstance(t, str) for col in texts for t in col):
+        raise ValueError("Bedrock returned no usable multi-column response")
+    return texts
+
+def build_dataset(schema, n_rows, seed, on_progress=None):
+    """Build a pyarrow Table for schema; on_progress(fraction) is called about ten times, not per column.
+
+    Columns are typed from the schema (ARROW_TYPES), so no dtype inference pass is needed.
+
+    A column's values depend only on seed, its own type and its position i, so editing one column
+    leaves every other column unchanged: non-batched columns are seeded with (seed, i) and cached,
+    batched ones take row i of a draw seeded with (seed, type).
+    """
+    step = max(1, len(schema) // 10)
+    done = 0
+    reported = 0
+
+    def advance(count=1):
+        # mark count more columns finished; report every step columns and once at the end
+        nonlocal done, reported
+        done += count
+        if on_progress is not None and (done - reported >= step or done == len(schema)):
+            reported = done
+            on_progress(done / len(schema))
+
+    # one 2-D draw per batchable type; each row of the result is a contiguous column. Row i always
+    # belongs to column i, and the rows before it come from the same (seed, type) stream whatever
+    # the other columns are, so column i's values never depend on the rest of the schema
+    columns = [None] * len(schema)
+    for col_type in BATCH_TYPES:
+        idx = [i for i, col in enumerate(schema) if col["type"] == col_type]
+        if idx:
+            rng = np.random.default_rng([seed, ALL_TYPES.index(col_type)])
+            batch = _generate_batch(col_type, n_rows, idx[-1] + 1, rng)
+            for i, values in zip(idx, batch[idx]):
+                columns[i] = values
+            advance(len(idx))
+
+    # Several Text (AI) columns are first requested together; if that fails, the per-column
+    # calls are I/O-bound, so they run on threads and the AIMD limiter decides how many are in flight
+    ai_idx = [i for i, col in enumerate(schema) if col["type"] == "Text (AI)"]
+    if ENABLE_BEDROCK and len(ai_idx) > 1:
+        try:
+            # one request for every Text (AI) column instead of one per column
+            texts = generate_text_ai_columns(n_rows, tuple((seed, i) for i in ai_idx))
+        except ValueError:
+            texts = None
+        if texts is not None:
+            for i, values in zip(ai_idx, texts):
+                columns[i] = values
+            advance(len(ai_idx))
+        else:
+            ctx = get_script_run_ctx()
+            with ThreadPoolExecutor(
+                max_workers=min(len(ai_idx), BEDROCK_MAX_CONCURRENCY),
+                initializer=add_script_run_ctx,
+                initargs=(None, ctx),
+            ) as pool:
+                futures = {pool.submit(generate_column, "Text (AI)", n_rows, (seed, i)): i for i in ai_idx}
+                # collected on the script thread, so progress updates as each column finishes
+                for future in as_completed(futures):
+                    columns[futures[future]] = future.result()
+                    advance()
+
     data = {}
-    for col in schema:
+    types = {}
+    for i, col in enumerate(schema):
         name = col["name"]
         col_type = col["type"]
-        data[name] = generate_column(col_type, n_rows)
-    return pd.DataFrame(data)
+        if columns[i] is None:
+            columns[i] = generate_column(col_type, n_rows, (seed, i))
+            advance()
+        data[name] = columns[i]
+        types[name] = ARROW_TYPES.get(col_type, pa.string())
+    arrow_schema = pa.schema([(name, types[name]) for name in data])
+    return pa.Table.from_pydict(data, schema=arrow_schema)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _histogram(values, bins):
+    """Histogram counts indexed by left bin edge; cached so reruns with the same column/bins skip np.histogram."""
+    counts, edges = np.histogram(values, bins=bins)
+    return pd.DataFrame({"count": counts}, index=pd.Index(edges[:-1], name="bin_left"))
+
+def encode_exports(table):
+    """Serialize the Arrow table once into the binary download formats."""
+    # zstd level 3 compresses better than snappy/lz4 at a similar write speed
+    parquet_buffer = BytesIO()
+    pq.write_table(table, parquet_buffer, compression="zstd", compression_level=3)
+    feather_buffer = BytesIO()
+    feather.write_feather(table, feather_buffer, compression="zstd", compression_level=3)
+    return {"parquet": parquet_buffer.getvalue(), "feather": feather_buffer.getvalue()}
+
+# Columns in the initial schema grid, and the most that are generated
+DEFAULT_NUM_COLS = 3
+MAX_COLS = 20
+
+# Session-state keys that belong to the currently stored dataset
+DATASET_KEYS = ["table", "exports", "metadata", "csv"]
 
 # ---- Streamlit UI ----
 st.set_page_config(page_title="SynGenie - Smart Synthetic Data", layout="wide")
@@ -119,83 +469,111 @@ st.caption("Define your schema, generate synthetic data, preview, visualize, and
 
 st.sidebar.header("Configuration")
 n_rows = st.sidebar.number_input("Number of rows", min_value=10, max_value=100000, value=100, step=10)
+seed = st.sidebar.number_input(
+    "Random seed",
+    min_value=0,
+    value=42,
+    step=1,
+    help="The same seed and schema reproduce the same dataset; change it for fresh data.",
+)
 
 st.sidebar.markdown("### Schema Columns")
-num_cols = st.sidebar.number_input("Number of columns", min_value=1, max_value=20, value=3, step=1)
-
-schema = []
-for i in range(int(num_cols)):
-    st.sidebar.markdown(f"**Column {i+1}**")
-    col_name = st.sidebar.text_input(f"Name for column {i+1}", value=f"col_{i+1}", key=f"name_{i}")
-    col_type = st.sidebar.selectbox(
-        f"Type for column {i+1}",
-        options=ALL_TYPES,
-        index=i % len(ALL_TYPES),
-        key=f"type_{i}",
-    )
-    schema.append({"name": col_name, "type": col_type})
+# One editable grid instead of a text input + selectbox per column. Columns are added and
+# removed as grid rows; the initial frame never changes and the key is fixed, so edits persist
+# across reruns
+schema_df = st.sidebar.data_editor(
+    pd.DataFrame(
+        {
+            "name": [f"col_{i+1}" for i in range(DEFAULT_NUM_COLS)],
+            "type": [ALL_TYPES[i % len(ALL_TYPES)] for i in range(DEFAULT_NUM_COLS)],
+        }
+    ),
+    column_config={
+        "name": st.column_config.TextColumn("Name", required=True),
+        "type": st.column_config.SelectboxColumn("Type", options=ALL_TYPES, required=True, default=ALL_TYPES[0]),
+    },
+    num_rows="dynamic",
+    hide_index=True,
+    use_container_width=True,
+    key="schema_editor",
+)
+# rows whose name or type is empty in the grid are skipped
+schema = [col for col in schema_df.to_dict("records") if col["name"] and col["type"]]
+if len(schema) > MAX_COLS:
+    st.sidebar.warning(f"Only the first {MAX_COLS} columns are generated.")
+    schema = schema[:MAX_COLS]
 
 st.sidebar.markdown("---")
-generate_btn = st.sidebar.button("Generate Data")
+generate_btn = st.sidebar.button("Generate Data", disabled=not schema)
 
 # If a dataset is stored in session, show quick controls
-if "df" in st.session_state:
+if "table" in st.session_state:
     st.sidebar.markdown("### Current Stored Dataset")
-    stored_df = st.session_state["df"]
-    st.sidebar.write(f"Rows: {stored_df.shape[0]} — Columns: {stored_df.shape[1]}")
+    stored_table = st.session_state["table"]
+    st.sidebar.write(f"Rows: {stored_table.num_rows} — Columns: {stored_table.num_columns}")
     if st.sidebar.button("Clear stored dataset"):
-        del st.session_state["df"]
-        if "metadata" in st.session_state:
-            del st.session_state["metadata"]
+        for key in DATASET_KEYS:
+            st.session_state.pop(key, None)
         st.experimental_rerun()
 
 if generate_btn:
     with st.spinner("Generating synthetic dataset..."):
         progress = st.progress(0)
-        # build_dataset is synchronous; show progress per-column
-        data = {}
-        for idx, col in enumerate(schema):
-            data[col["name"]] = generate_column(col["type"], int(n_rows))
-            progress.progress(int((idx + 1) / len(schema) * 100))
-        df = pd.DataFrame(data)
+        table = build_dataset(schema, int(n_rows), int(seed), on_progress=lambda done: progress.progress(int(done * 100)))
+        # binary exports are encoded once; preview and downloads reuse them on every rerun
+        exports = encode_exports(table)
         progress.empty()
 
     # persist dataset and metadata in session state
     metadata = {
         "generated_at": datetime.utcnow().isoformat() + "Z",
         "n_rows": int(n_rows),
+        "seed": int(seed),
         "schema": schema,
         "bedrock_enabled": ENABLE_BEDROCK,
         "bedrock_model": BEDROCK_MODEL if ENABLE_BEDROCK else None,
     }
-    st.session_state["df"] = df
+    st.session_state["table"] = table
+    st.session_state["exports"] = exports
     st.session_state["metadata"] = metadata
+    # CSV is serialized on demand; drop any copy prepared for the previous dataset
+    st.session_state.pop("csv", None)
+
+# Results render from session state so they survive reruns triggered by the widgets below
+if "table" in st.session_state:
+    table = st.session_state["table"]
+    exports = st.session_state["exports"]
 
     st.subheader("Data Preview")
-    st.dataframe(df.head(50), use_container_width=True)
+    st.dataframe(table.slice(0, 50), use_container_width=True)
 
-    # Download as CSV
-    csv_buffer = StringIO()
-    df.to_csv(csv_buffer, index=False)
+    # Download as Parquet / Feather (encoded once at generation time)
+    st.download_button(
+        label="Download Parquet (recommended)",
+        data=exports["parquet"],
+        file_name="synthetic_data.parquet",
+        mime="application/octet-stream",
+    )
     st.download_button(
-        label="Download CSV",
-        data=csv_buffer.getvalue(),
-        file_name="synthetic_data.csv",
-        mime="text/csv",
+        label="Download Feather",
+        data=exports["feather"],
+        file_name="synthetic_data.feather",
+        mime="application/octet-stream",
     )
 
-    # Download as Parquet
-    try:
-        parquet_buffer = BytesIO()
-        df.to_parquet(parquet_buffer, index=False)
+    # Download as CSV: serializing CSV is much slower than Parquet, so only do it when asked
+    if "csv" not in st.session_state:
+        if st.button("Prepare CSV"):
+            csv_buffer = BytesIO()
+            pacsv.write_csv(table, csv_buffer)
+            st.session_state["csv"] = csv_buffer.getvalue()
+    if "csv" in st.session_state:
         st.download_button(
-            label="Download Parquet",
-            data=parquet_buffer.getvalue(),
-            file_name="synthetic_data.parquet",
-            mime="application/octet-stream",
+            label="Download CSV",
+            data=st.session_state["csv"],
+            file_name="synthetic_data.csv",
+            mime="text/csv",
         )
-    except Exception:
-        st.info("Parquet export requires `pyarrow` or `fastparquet`. See README.")
 
     # Download metadata
     if "metadata" in st.session_state:
@@ -208,16 +586,17 @@ if generate_btn:
 
     # Simple charts
     st.subheader("Quick Visual Insights")
-    numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns.tolist()
+    numeric_cols = [
+        field.name for field in table.schema if pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+    ]
 
     if numeric_cols:
         chart_col = st.selectbox("Select numeric column to visualize", options=numeric_cols)
         bins = st.slider("Histogram bins", min_value=5, max_value=200, value=20)
-        series = df[chart_col].dropna().astype(float)
-        if not series.empty:
-            counts, edges = np.histogram(series, bins=bins)
-            hist_df = pd.DataFrame({"bin_left": edges[:-1], "count": counts})
-            hist_df = hist_df.set_index("bin_left")
+        # numeric_cols are already numeric, so no float copy is needed before np.histogram
+        values = table.column(chart_col).drop_null().to_numpy()
+        if values.size:
+            hist_df = _histogram(values, bins)
             st.bar_chart(hist_df["count"])
         else:
             st.info("Selected column has no numeric data to plot.")